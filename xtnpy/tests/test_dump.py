@@ -2,6 +2,10 @@ import xtn
 from . import utils
 from pathlib import Path
 import io
+import os
+import copy
+import pickle
+import pytest
 
 def match_obj(obj: xtn.XtnObject, sample_name):
     sio = io.StringIO()
@@ -32,3 +36,84 @@ def test_write_nbsp():
     obj = xtn.XtnObject()
     obj.elements['key1'] = xtn.XtnText('a\xa0b')
     match_obj(obj, 'retain_nbsp')
+
+def test_write_complex_text_spilled():
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        obj = xtn.XtnObject.load(f, spill_threshold=0)
+    expected = io.StringIO()
+    utils.load_sample_xtn_obj('complex_text').dump(expected)
+    sio = io.StringIO()
+    obj.dump(sio)
+    assert sio.getvalue() == expected.getvalue()
+
+def test_write_streamed_text():
+    obj = xtn.XtnObject()
+    obj.elements['key1'] = xtn.XtnText(io.StringIO('a\n  b\nc\n'))
+    obj.elements['key2'] = xtn.XtnText(iter(['a', '  b', 'c']))
+    obj.elements['key3'] = xtn.XtnText(['a\n', '\n', 'c'])
+    sio = io.StringIO()
+    obj.dump(sio)
+    assert sio.getvalue() == "key1'':\n    a\n      b\n    c\n----\nkey2'':\n    a\n      b\n    c\n----\nkey3'':\n    a\n    \n    c\n----\n"
+    with pytest.raises(ValueError):
+        obj.dump(io.StringIO())
+
+def test_write_streamed_text_line_breaks():
+    obj = xtn.XtnObject()
+    obj.elements['key1'] = xtn.XtnText(['a\n\n'])
+    with pytest.raises(ValueError):
+        obj.dump(io.StringIO())
+
+def test_close_files():
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        obj = xtn.XtnObject.load(f, spill_threshold=0)
+    text_file = obj.elements['key1'].value
+    xtn.close_files(obj)
+    assert text_file.closed and not os.path.exists(text_file.path)
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        data = xtn.load(f, spill_threshold=0)
+    with data['key2'] as text_file:
+        assert text_file.read() == 'a\n  b\nc\n'
+    assert text_file.closed and not os.path.exists(text_file.path)
+
+def test_spilled_text_copy():
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        data = xtn.load(f, spill_threshold=0)
+    copied = copy.deepcopy(data)
+    assert copied['key1'] is data['key1']
+    del copied
+    assert data['key1'].read() == 'a\n-----'
+    with pytest.raises(TypeError):
+        pickle.dumps(data['key1'])
+
+class NamedStringIO(io.StringIO):
+    name = 'string'
+
+def test_spilled_text_removed_on_error(monkeypatch):
+    created = []
+    named_temporary_file = xtn._xtn.tempfile.NamedTemporaryFile
+    def record(*args, **kwargs):
+        f = named_temporary_file(*args, **kwargs)
+        created.append(f)
+        return f
+    monkeypatch.setattr(xtn._xtn.tempfile, 'NamedTemporaryFile', record)
+    with pytest.raises(xtn.XtnException):
+        xtn.load(NamedStringIO("key1'':\n    a\n    b\n"), spill_threshold=0)
+    assert len(created) == 1
+    assert created[0].closed and not os.path.exists(created[0].name)
+
+def test_write_frozen_one_shot():
+    obj = xtn.freeze(xtn.XtnObject({'key1': xtn.XtnText(iter(['a', 'b']))}))
+    sio = io.StringIO()
+    obj.dump(sio)
+    assert sio.getvalue() == "key1'':\n    a\n    b\n----\n"
+    with pytest.raises(ValueError):
+        obj.dump(io.StringIO())
+
+def test_write_spilled_crlf():
+    source = "key1'':\r\n    a\r\n    b\r\n----\r\n"
+    expected = "key1'':\n    a\n    b\n----\n"
+    for threshold in (None, 0):
+        obj = xtn.XtnObject.load(NamedStringIO(source, newline=''), spill_threshold=threshold)
+        sio = io.StringIO()
+        obj.dump(sio)
+        assert sio.getvalue() == expected
@@ -0,0 +1,113 @@
+import xtn
+from . import utils
+import io
+import pytest
+import threading
+import pickle
+
+
+def load_frozen(name: str):
+    with open(utils.sample_xtn_path(name), 'r') as f:
+        return xtn.load(f, frozen=True)
+
+def load_frozen_obj(name: str):
+    with open(utils.sample_xtn_path(name), 'r') as f:
+        return xtn.XtnObject.load(f, frozen=True)
+
+def test_load_frozen():
+    data = load_frozen('sample1')
+    assert isinstance(data, xtn.XtnFrozenDict)
+    assert isinstance(data['key2'], xtn.XtnFrozenDict)
+    assert data['key2']['key4'] == ('value41', 'value42')
+    assert isinstance(data['key2']['key8'][0], xtn.XtnFrozenDict)
+    assert data == xtn.freeze(utils.load_sample_json('sample1'))
+    assert hash(data) == hash(xtn.freeze(utils.load_sample_json('sample1')))
+    with pytest.raises(TypeError):
+        data['key1'] = 'x'  # type: ignore
+
+def test_load_frozen_obj():
+    obj = load_frozen_obj('comments1')
+    assert obj.frozen
+    assert isinstance(obj.elements, xtn.XtnFrozenDict)
+    key2_val = obj.elements['key2']
+    assert isinstance(key2_val, xtn.XtnObject) and key2_val.frozen
+    assert isinstance(key2_val.elements['key4'].elements, tuple)
+    assert isinstance(key2_val.comments_below, tuple) and key2_val.comments_below[0].value == 'below key2'
+    with pytest.raises(AttributeError):
+        key2_val.elements['key3'].value = 'x'
+    with pytest.raises(AttributeError):
+        key2_val.comments_below[0].value = 'x'
+    sio = io.StringIO()
+    obj.dump(sio)
+    assert sio.getvalue() == utils.sample_xtn_path('comments1_formatted').read_text()
+
+def test_freeze_obj():
+    orig = utils.load_sample_xtn_obj('sample1')
+    obj = xtn.freeze(orig)
+    assert obj.frozen and not orig.frozen
+    assert obj.elements['key2'].comments_above[1].value == 'This is a comment'
+    assert xtn.freeze(obj) is obj
+
+def test_thaw():
+    data = load_frozen('sample1')
+    thawed = xtn.thaw(data)
+    thawed['key2']['key4'].append('value43')
+    thawed['key2']['key8'][0]['key9'] = 'changed'
+    del thawed['key1']
+    assert 'key1' not in thawed
+    assert thawed['key2']['key4'] == ['value41', 'value42', 'value43']
+    assert thawed['key2']['key8'][0]['key9'] == 'changed'
+    assert data['key1'] == 'value1'
+    assert data['key2']['key4'] == ('value41', 'value42')
+    assert data['key2']['key8'][0]['key9'] == 'value91'
+    assert xtn.thaw(load_frozen('sample1')) == utils.load_sample_json('sample1')
+
+def test_thaw_obj():
+    obj = load_frozen_obj('sample1')
+    thawed = xtn.thaw(obj)
+    thawed.elements['key2'].elements['key3'].value = 'changed'
+    assert obj.elements['key2'].elements['key3'].value == 'value3'
+    sio = io.StringIO()
+    xtn.thaw(obj).dump(sio)
+    assert sio.getvalue() == utils.sample_xtn_path('sample1_formatted').read_text()
+
+def test_frozen_spilled_text_shared_between_threads():
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        data = xtn.load(f, spill_threshold=0, frozen=True)
+    text_file = data['key4'][4]
+    assert isinstance(text_file, xtn.XtnTextFile)
+    expected = utils.load_sample_json('complex_text')['key4'][4]
+    with text_file.open() as r1, text_file.open() as r2:
+        assert r1.readline() == r2.readline()
+    results = []
+    def read():
+        for _ in range(50):
+            results.append(text_file.read() == expected and ''.join(text_file) == expected)
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 400 and all(results)
+    xtn.close_files(data)
+
+def test_pickle_frozen():
+    obj = load_frozen_obj('comments1')
+    copied = pickle.loads(pickle.dumps(obj))
+    assert copied.frozen and isinstance(copied, xtn.XtnObject)
+    assert copied == obj
+    with pytest.raises(AttributeError):
+        copied.elements['key1'].value = 'x'
+    data = load_frozen('sample1')
+    assert pickle.loads(pickle.dumps(data)) == data
+
+def test_frozen_obj_value_equality():
+    a = load_frozen_obj('sample1')
+    b = load_frozen_obj('sample1')
+    assert a is not b
+    assert a == b and hash(a) == hash(b)
+    assert a.elements == b.elements and hash(a.elements) == hash(b.elements)
+    assert a != load_frozen_obj('comments1')
+    assert xtn.freeze(xtn.XtnText('a')) == xtn.freeze(xtn.XtnText('a'))
+    assert xtn.freeze(xtn.XtnText('a')) != xtn.freeze(xtn.XtnText('b'))
+    assert xtn.XtnText('a') != xtn.XtnText('a')
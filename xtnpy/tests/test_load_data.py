@@ -3,15 +3,16 @@ from pathlib import Path
 import xtn
 import pytest
 import re
+import io
 
 def exact_match(name: str):
     x = utils.load_sample_xtn(name)
     j = utils.load_sample_json(name)
     assert x == j
 
-def match_error(name: str, code: xtn.XtnErrorCode, line: int):
+def match_error(name: str, code: xtn.XtnErrorCode, line: int, limits: xtn.XtnLimits | None = None):
     with pytest.raises(xtn.XtnException) as ex:
-        utils.load_sample_xtn(name)
+        utils.load_sample_xtn(name, limits)
     assert ex.value.code == code
     m = re.search(r'^.*?:(\d+): error: ', ex.value.message)
     assert m is not None
@@ -222,4 +223,70 @@ def test_bad_key_in_arr1():
     match_error('bad_key_in_arr1', xtn.XtnErrorCode.ARRAY_ELEMENT_MUST_NOT_HAVE_A_KEY, 5)
 
 def test_repeated_key_in_obj1():
-    match_error('repeated_key_in_obj1', xtn.XtnErrorCode.OBJECT_KEYS_CANNOT_BE_REPEATED, 4)
\ No newline at end of file
+    match_error('repeated_key_in_obj1', xtn.XtnErrorCode.OBJECT_KEYS_CANNOT_BE_REPEATED, 4)
+
+def read_spilled(value):
+    if isinstance(value, list):
+        return [read_spilled(v) for v in value]
+    if isinstance(value, dict):
+        return {k: read_spilled(v) for k, v in value.items()}
+    if isinstance(value, xtn.XtnTextFile):
+        return value.read()
+    return value
+
+def test_complex_text_spilled():
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        x = xtn.load(f, spill_threshold=0)
+    assert isinstance(x['key1'], xtn.XtnTextFile)
+    assert read_spilled(x) == utils.load_sample_json('complex_text')
+
+def test_complex_text_spill_threshold():
+    with open(utils.sample_xtn_path('complex_text'), 'r') as f:
+        x = xtn.load(f, spill_threshold=8)
+    assert x['key1'] == 'a\n-----'
+    assert isinstance(x['key2'], xtn.XtnTextFile)
+    assert x['key2'].read() == 'a\n  b\nc\n'
+
+def test_limits_not_exceeded():
+    limits = xtn.XtnLimits(max_size=1000, max_line_length=60, max_depth=3, max_keys=5, max_text_length=17)
+    assert utils.load_sample_xtn('sample1', limits) == utils.load_sample_json('sample1')
+    utils.load_sample_xtn_obj('sample1', limits)
+
+def test_max_size():
+    match_error('sample1', xtn.XtnErrorCode.MAX_SIZE_EXCEEDED, 4, xtn.XtnLimits(max_size=50))
+
+def test_max_size_long_line():
+    class Reader(io.StringIO):
+        name = 'long_line'
+        read_size = 0
+        def readline(self, size=-1):
+            line = super().readline(size)
+            self.read_size += len(line)
+            return line
+    f = Reader('key1: value1\nkey2: ' + 'x' * 100000 + '\n')
+    with pytest.raises(xtn.XtnException) as ex:
+        xtn.load(f, limits=xtn.XtnLimits(max_size=100))
+    assert ex.value.code == xtn.XtnErrorCode.MAX_SIZE_EXCEEDED
+    assert f.read_size == 101
+
+def test_max_line_length():
+    match_error('sample1', xtn.XtnErrorCode.MAX_LINE_LENGTH_EXCEEDED, 4, xtn.XtnLimits(max_line_length=20))
+
+def test_max_depth():
+    match_error('sample1', xtn.XtnErrorCode.MAX_DEPTH_EXCEEDED, 8, xtn.XtnLimits(max_depth=1))
+    match_error('sample1', xtn.XtnErrorCode.MAX_DEPTH_EXCEEDED, 20, xtn.XtnLimits(max_depth=2))
+
+def test_max_keys():
+    match_error('sample1', xtn.XtnErrorCode.MAX_KEYS_EXCEEDED, 12, xtn.XtnLimits(max_keys=2))
+
+def test_max_text_length():
+    match_error('sample1', xtn.XtnErrorCode.MAX_TEXT_LENGTH_EXCEEDED, 17, xtn.XtnLimits(max_text_length=16))
+
+def test_max_line_length_crlf():
+    class Reader(io.StringIO):
+        name = 'crlf'
+    limits = xtn.XtnLimits(max_line_length=8)
+    assert xtn.load(Reader('k: 12345\r\nl: 6\r\n', newline=''), limits=limits) == {'k': '12345', 'l': '6'}
+    with pytest.raises(xtn.XtnException) as ex:
+        xtn.load(Reader('k: 123456\r\n', newline=''), limits=limits)
+    assert ex.value.code == xtn.XtnErrorCode.MAX_LINE_LENGTH_EXCEEDED
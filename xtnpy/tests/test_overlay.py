@@ -0,0 +1,111 @@
+import xtn
+import io
+
+
+def load(text: str):
+    return xtn.load(io.StringIO(text))
+
+def load_obj(text: str):
+    return xtn.XtnObject.load(io.StringIO(text))
+
+base = '''
+name: base
+port: 80
+db{}:
+    host: localhost
+    user: admin
+----
+hosts[]:
+    +: a
+----
+'''
+
+region = '''
+port: 8080
+db{}:
+    host: region-db
+----
+'''
+
+host = '''
+name: host1
+hosts[]:
+    +: b
+----
+'''
+
+def test_last_layer_wins():
+    overlay = xtn.XtnOverlay(load(base), load(region), load(host))
+    assert overlay['name'] == 'host1'
+    assert overlay['port'] == '8080'
+    assert overlay['hosts'] == ['b']
+
+def test_objects_are_merged():
+    overlay = xtn.XtnOverlay(load(base), load(region), load(host))
+    db = overlay['db']
+    assert isinstance(db, xtn.XtnOverlay)
+    assert db['host'] == 'region-db'
+    assert db['user'] == 'admin'
+    assert overlay['db', 'user'] == 'admin'
+    assert overlay['db'] is db
+    assert ('db', 'password') not in overlay
+    assert list(overlay) == ['name', 'port', 'db', 'hosts']
+
+def test_value_hides_objects_below():
+    overlay = xtn.XtnOverlay(load(base), {'db': 'none'})
+    assert overlay['db'] == 'none'
+    assert overlay.materialize()['db'] == 'none'
+
+def test_materialize():
+    overlay = xtn.XtnOverlay(load(base), load(region), load(host))
+    assert overlay.materialize() == {
+        'name': 'host1',
+        'port': '8080',
+        'db': {'host': 'region-db', 'user': 'admin'},
+        'hosts': ['b'],
+    }
+
+def test_xtn_object_layers():
+    overlay = xtn.XtnOverlay(load_obj(base), load_obj(region))
+    port = overlay['port']
+    assert isinstance(port, xtn.XtnText) and port.value == '8080'
+    merged = overlay.materialize()
+    assert isinstance(merged, xtn.XtnObject)
+    db = merged.elements['db']
+    assert isinstance(db, xtn.XtnObject)
+    assert db.elements['host'].value == 'region-db'
+    assert db.elements['user'].value == 'admin'
+
+def test_mixed_layers():
+    overlay = xtn.XtnOverlay(load(base), load_obj(region))
+    merged = overlay.materialize()
+    assert isinstance(merged, xtn.XtnObject)
+    assert isinstance(merged.elements['name'], xtn.XtnText) and merged.elements['name'].value == 'base'
+    hosts = merged.elements['hosts']
+    assert isinstance(hosts, xtn.XtnArray) and hosts.elements[0].value == 'a'
+    sio = io.StringIO()
+    merged.dump(sio)
+    assert xtn.load(io.StringIO(sio.getvalue())) == overlay.materialize(as_xtn=False)
+    assert xtn.XtnOverlay(load_obj(base), load(region)).materialize() == {
+        'name': 'base',
+        'port': '8080',
+        'db': {'host': 'region-db', 'user': 'admin'},
+        'hosts': ['a'],
+    }
+
+def test_no_layers():
+    overlay = xtn.XtnOverlay()
+    assert len(overlay) == 0
+    assert overlay.materialize() == {}
+
+def test_frozen_layer():
+    overlay = xtn.XtnOverlay(xtn.load(io.StringIO(base), frozen=True), load(region))
+    merged = overlay.materialize(as_xtn=False)
+    assert type(merged['db']) is dict
+    assert type(merged['hosts']) is list
+    assert merged == {
+        'name': 'base',
+        'port': '8080',
+        'db': {'host': 'region-db', 'user': 'admin'},
+        'hosts': ['a'],
+    }
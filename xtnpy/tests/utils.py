@@ -14,10 +14,10 @@ def load_sample_json(name: str):
     with open(sample_json_path(name), 'r') as f:
         return json.load(f)
     
-def load_sample_xtn(name: str):
+def load_sample_xtn(name: str, limits: xtn.XtnLimits | None = None):
     with open(sample_xtn_path(name), 'r') as f:
-        return xtn.load(f)
+        return xtn.load(f, limits=limits)
     
-def load_sample_xtn_obj(name: str):
+def load_sample_xtn_obj(name: str, limits: xtn.XtnLimits | None = None):
     with open(sample_xtn_path(name), 'r') as f:
-        return xtn.XtnObject.load(f)
\ No newline at end of file
+        return xtn.XtnObject.load(f, limits=limits)
\ No newline at end of file
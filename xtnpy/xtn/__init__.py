@@ -1 +1 @@
-from ._xtn import XtnErrorCode, XtnException, XtnElement, XtnComment, XtnDataElement, XtnText, XtnArray, XtnObject, load
+from ._xtn import XtnErrorCode, XtnException, XtnLimits, XtnElement, XtnComment, XtnDataElement, XtnText, XtnTextFile, XtnArray, XtnObject, XtnOverlay, XtnFrozenDict, XtnThawedDict, XtnThawedList, load, freeze, thaw, close_files
@@ -1,7 +1,10 @@
-from typing import Any, Callable, Literal, NoReturn, TextIO
+from typing import IO, Any, Callable, Iterable, Literal, Mapping, MutableMapping, MutableSequence, NoReturn, Sequence, TextIO
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import os
 import re
+import tempfile
+import weakref
 
 
 class XtnErrorCode(Enum):
@@ -20,6 +23,11 @@ class XtnErrorCode(Enum):
     ARRAY_ELEMENT_MUST_NOT_HAVE_A_KEY = 13
     OBJECT_KEYS_CANNOT_BE_REPEATED = 14
     INCORRECT_INDENTATION = 15
+    MAX_SIZE_EXCEEDED = 16
+    MAX_LINE_LENGTH_EXCEEDED = 17
+    MAX_DEPTH_EXCEEDED = 18
+    MAX_KEYS_EXCEEDED = 19
+    MAX_TEXT_LENGTH_EXCEEDED = 20
 
 
 class XtnException(Exception):
@@ -29,6 +37,18 @@ class XtnException(Exception):
         self.message = message
 
 
+@dataclass
+class XtnLimits:
+    '''Bounds applied while loading untrusted input. None means unlimited. Sizes and lengths are in characters.
+    Line lengths do not include the line terminator. With max_size or max_line_length set, input is never read
+    more than two characters past the limit.'''
+    max_size: int | None = None
+    max_line_length: int | None = None
+    max_depth: int | None = None
+    max_keys: int | None = None
+    max_text_length: int | None = None
+
+
 class _Mode(Enum):
     OBJECT = 1
     ARRAY = 2
@@ -36,6 +56,8 @@ class _Mode(Enum):
 
 
 class XtnElement:
+    frozen = False
+
     def __init__(self) -> None:
         pass
 
@@ -54,9 +76,79 @@ class XtnDataElement(XtnElement):
         self.comments_below = comments_below
 
 
+class XtnTextFile:
+    '''A complex text value that was too large to keep in memory and was written to a temporary file while loading.
+    Every reader opens the file separately, so the value can be read from several threads at once.'''
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._finalizer: weakref.finalize | None = None
+
+    @property
+    def closed(self) -> bool:
+        return self._finalizer is not None and not self._finalizer.alive
+
+    def open(self) -> IO[str]:
+        return open(self.path, 'r', encoding='utf-8', newline='')
+
+    def read(self) -> str:
+        with self.open() as f:
+            return f.read()
+
+    def __iter__(self):
+        with self.open() as f:
+            yield from f
+
+    def close(self):
+        '''Removes the temporary file if this handle owns it'''
+        if self._finalizer is not None:
+            self._finalizer()
+
+    # the handle stands for an immutable value, copies share it and only the original removes the file
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo: dict):
+        return self
+
+    def __reduce__(self):
+        raise TypeError("XtnTextFile cannot be pickled, read the value into a str first")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args: object):
+        self.close()
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _strip_line_end(line: str) -> str:
+    return line[0:-2] if line.endswith('\r\n') else line[0:-1] if line.endswith('\n') else line
+
+
+class _OneShotLines:
+    '''Wraps an iterator (such as an open file) given as a text value, so that a second dump fails instead of writing nothing'''
+
+    def __init__(self, lines: Iterable[str]) -> None:
+        self.lines = lines
+        self.consumed = False
+
+    def __iter__(self):
+        self.consumed = True
+        return iter(self.lines)
+
+
 class XtnText(XtnDataElement):
-    def __init__(self, value: str, force_multiline: bool = False, comments_above: list[XtnComment] | None = None, comments_below: list[XtnComment] | None = None) -> None:
+    def __init__(self, value: str | XtnTextFile | TextIO | Iterable[str], force_multiline: bool = False, comments_above: list[XtnComment] | None = None, comments_below: list[XtnComment] | None = None) -> None:
         super().__init__(comments_above)
+        if type(value) is not str and not isinstance(value, (str, XtnTextFile, _OneShotLines)) and iter(value) is value:
+            value = _OneShotLines(value)
         self.value = value
         self.force_multiline = force_multiline
 
@@ -77,9 +169,9 @@ class XtnObject(XtnDataElement):
         self.comments_inner_bottom = comments_inner_bottom
 
     @staticmethod
-    def load(f: TextIO):
+    def load(f: TextIO, spill_threshold: int | None = None, limits: XtnLimits | None = None, frozen: bool = False):
         obj = XtnObject({})
-        _load(f, obj)
+        _load(f, obj, spill_threshold, limits, frozen)
         return obj
 
     def dump(self, f: TextIO):
@@ -125,6 +217,30 @@ class XtnObject(XtnDataElement):
                     write_pair(child_name, child_value, child_indent)
                 write_comments(data.comments_inner_bottom, child_indent)
                 write(indent, '----')
+            elif isinstance(data, XtnText) and isinstance(data.value, XtnTextFile):
+                # the file holds the exact text, so a final newline means a final empty line
+                write(indent, name, "'':")
+                child_indent = indent + '    '
+                ends_with_newline = False
+                for line in data.value:
+                    stripped = _strip_line_end(line)
+                    ends_with_newline = len(stripped) < len(line)
+                    write(child_indent, stripped)
+                if ends_with_newline:
+                    write(child_indent)
+                write(indent, '----')
+            elif isinstance(data, XtnText) and not isinstance(data.value, str):
+                # any other file or iterable yields one line per item, with an optional line terminator
+                if isinstance(data.value, _OneShotLines) and data.value.consumed:
+                    raise ValueError(f"The value of {name} is an iterator that was already consumed by an earlier dump")
+                write(indent, name, "'':")
+                child_indent = indent + '    '
+                for item in data.value:
+                    line = _strip_line_end(item)
+                    if line.splitlines() not in ([], [line]):
+                        raise ValueError(f"A line of the value of {name} must not contain line breaks")
+                    write(child_indent, line)
+                write(indent, '----')
             elif isinstance(data, XtnText):
                 sv = data.value
                 lines = sv.splitlines()
@@ -146,6 +262,360 @@ class XtnObject(XtnDataElement):
         write_comments(self.comments_inner_bottom, '')
 
 
+def close_files(value: Any):
+    '''Closes every XtnTextFile in a loaded value (dict, list or XtnElement), releasing the temporary files of spilled text'''
+    if isinstance(value, XtnTextFile):
+        value.close()
+    elif isinstance(value, XtnText):
+        close_files(value.value)
+    elif isinstance(value, XtnObject):
+        close_files(value.elements)
+    elif isinstance(value, XtnArray):
+        close_files(value.elements)
+    elif isinstance(value, Mapping):
+        for v in value.values():
+            close_files(v)
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            close_files(v)
+
+
+def _object_elements(value: Any) -> Mapping[str, Any] | None:
+    if isinstance(value, XtnObject):
+        return value.elements
+    elif isinstance(value, Mapping):
+        return value
+    return None
+
+
+class XtnFrozenDict(Mapping[str, Any]):
+    '''An immutable, hashable mapping used for objects in frozen trees. It wraps the dict it is given without copying it.'''
+
+    def __init__(self, data: dict[str, Any]) -> None:
+        self._data = data
+        self._hash: int | None = None
+
+    def __getitem__(self, key: str):
+        return self._data[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, XtnFrozenDict):
+            return self._data == other._data
+        return super().__eq__(other)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"XtnFrozenDict({self._data!r})"
+
+
+class XtnThawedDict(MutableMapping[str, Any]):
+    '''A mutable copy-on-write view of an XtnFrozenDict. Changes are kept locally and children are thawed on access.'''
+
+    def __init__(self, base: XtnFrozenDict) -> None:
+        self._base = base
+        self._local: dict[str, Any] = {}
+        self._deleted: set[str] = set()
+
+    def __getitem__(self, key: str):
+        if key in self._local:
+            return self._local[key]
+        if key in self._deleted:
+            raise KeyError(key)
+        value = self._base[key]
+        thawed = thaw(value)
+        if thawed is not value:
+            self._local[key] = thawed
+        return thawed
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._local[key] = value
+        self._deleted.discard(key)
+
+    def __delitem__(self, key: str) -> None:
+        if key not in self:
+            raise KeyError(key)
+        self._local.pop(key, None)
+        if key in self._base:
+            self._deleted.add(key)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._local or (key in self._base and key not in self._deleted)
+
+    def __iter__(self):
+        for key in self._base:
+            if key not in self._deleted:
+                yield key
+        for key in self._local:
+            if key not in self._base:
+                yield key
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+
+class XtnThawedList(MutableSequence[Any]):
+    '''A mutable copy-on-write view of a frozen tuple. The tuple is copied on the first change and children are thawed on access.'''
+
+    def __init__(self, base: tuple) -> None:
+        self._base = base
+        self._items: list | None = None
+
+    def _own(self) -> list:
+        if self._items is None:
+            self._items = list(self._base)
+        return self._items
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        value = (self._base if self._items is None else self._items)[index]
+        thawed = thaw(value)
+        if thawed is not value:
+            self._own()[index] = thawed
+        return thawed
+
+    def __setitem__(self, index, value) -> None:
+        self._own()[index] = value
+
+    def __delitem__(self, index) -> None:
+        del self._own()[index]
+
+    def __len__(self) -> int:
+        return len(self._base if self._items is None else self._items)
+
+    def insert(self, index: int, value: Any) -> None:
+        self._own().insert(index, value)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence) or isinstance(other, str):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+
+_comment_props = ('comments_above', 'comments_below', 'comments_inner_top', 'comments_inner_bottom')
+
+
+class _Frozen:
+    '''Mixed into the class of a sealed element. Frozen elements reject assignment and compare and hash by value.'''
+    frozen = True
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__bases__[1].__name__} is frozen")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError(f"{type(self).__bases__[1].__name__} is frozen")
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return vars(self) == vars(other)
+
+    def __hash__(self) -> int:
+        return hash(tuple(sorted(vars(self).items())))
+
+
+# defined at module level so that frozen trees can be pickled
+class _FrozenXtnComment(_Frozen, XtnComment):
+    pass
+
+
+class _FrozenXtnText(_Frozen, XtnText):
+    pass
+
+
+class _FrozenXtnArray(_Frozen, XtnArray):
+    pass
+
+
+class _FrozenXtnObject(_Frozen, XtnObject):
+    pass
+
+
+_frozen_classes: dict[type, type] = {
+    XtnComment: _FrozenXtnComment,
+    XtnText: _FrozenXtnText,
+    XtnArray: _FrozenXtnArray,
+    XtnObject: _FrozenXtnObject,
+}
+
+
+def _seal(element: XtnElement):
+    if element.frozen:
+        return
+    for prop in _comment_props:
+        comments = getattr(element, prop, None)
+        if comments is not None and not isinstance(comments, tuple):
+            for comment in comments:
+                _seal(comment)
+            setattr(element, prop, tuple(comments))
+    # only sealed elements get the class that blocks assignment, so mutable trees pay nothing for it
+    cls = type(element)
+    frozen_cls = _frozen_classes.get(cls)
+    if frozen_cls is None:
+        frozen_cls = _frozen_classes[cls] = type(cls.__name__, (_Frozen, cls), {})
+    element.__class__ = frozen_cls
+
+
+def freeze(value: Any) -> Any:
+    '''Returns an immutable copy of a loaded value (dict, list or XtnElement) that can be shared across threads.
+    Objects become XtnFrozenDict and arrays become tuple. Values that are already frozen are returned as they are.'''
+    if isinstance(value, XtnFrozenDict) or isinstance(value, XtnElement) and value.frozen:
+        return value
+    if isinstance(value, XtnComment):
+        element = XtnComment(value.value, value.prefix)
+    elif isinstance(value, XtnText):
+        element = XtnText(value.value, value.force_multiline)
+    elif isinstance(value, XtnArray):
+        element = XtnArray(tuple(freeze(v) for v in value.elements))  # type: ignore
+    elif isinstance(value, XtnObject):
+        element = XtnObject(XtnFrozenDict({k: freeze(v) for k, v in value.elements.items()}))
+    elif isinstance(value, Mapping):
+        return XtnFrozenDict({k: freeze(v) for k, v in value.items()})
+    elif isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    else:
+        return value
+    for prop in _comment_props:
+        comments = getattr(value, prop, None)
+        if comments is not None:
+            setattr(element, prop, [freeze(c) for c in comments])
+    _seal(element)
+    return element
+
+
+def thaw(value: Any) -> Any:
+    '''Returns a mutable copy-on-write view of a frozen value. Only the parts that are accessed are copied.
+    Values that are not frozen are returned as they are.'''
+    if isinstance(value, XtnFrozenDict):
+        return XtnThawedDict(value)
+    elif isinstance(value, tuple):
+        return XtnThawedList(value)
+    elif not isinstance(value, XtnElement) or not value.frozen:
+        return value
+    if isinstance(value, XtnComment):
+        return XtnComment(value.value, value.prefix)
+    elif isinstance(value, XtnText):
+        element = XtnText(value.value, value.force_multiline)
+    elif isinstance(value, XtnArray):
+        element = XtnArray(XtnThawedList(value.elements))  # type: ignore
+    elif isinstance(value, XtnObject):
+        element = XtnObject(XtnThawedDict(value.elements))  # type: ignore
+    else:
+        return value
+    for prop in _comment_props:
+        comments = getattr(value, prop, None)
+        if comments is not None:
+            setattr(element, prop, [thaw(c) for c in comments])
+    return element
+
+
+class XtnOverlay(Mapping[str, Any]):
+    '''A read-only view that stacks loaded documents (dict or XtnObject), with later layers overriding earlier ones.
+    Objects at the same key are merged recursively and resolved lazily, on first access.'''
+
+    def __init__(self, *layers: dict[str, Any] | XtnObject) -> None:
+        self.layers = layers
+        self._cache: dict[str, Any] = {}
+
+    def _resolve(self, key: str):
+        if key in self._cache:
+            return self._cache[key]
+        found = False
+        value = None
+        objects = []
+        for layer in reversed(self.layers):
+            elements = _object_elements(layer)
+            if elements is None or key not in elements:
+                continue
+            child = elements[key]
+            if _object_elements(child) is None:
+                # a non-object value hides any objects below it
+                if len(objects) == 0:
+                    found = True
+                    value = child
+                break
+            objects.append(child)
+        if len(objects) > 0:
+            found = True
+            value = XtnOverlay(*reversed(objects))
+        if not found:
+            raise KeyError(key)
+        self._cache[key] = value
+        return value
+
+    def __getitem__(self, key: str | tuple[str, ...]):
+        if not isinstance(key, tuple):
+            return self._resolve(key)
+        value = self
+        for k in key:
+            if not isinstance(value, XtnOverlay):
+                raise KeyError(key)
+            value = value._resolve(k)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        try:
+            self[key]  # type: ignore
+        except KeyError:
+            return False
+        return True
+
+    def __iter__(self):
+        keys: dict[str, None] = {}
+        for layer in self.layers:
+            keys.update(dict.fromkeys(_object_elements(layer) or ()))
+        return iter(keys)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def materialize(self, as_xtn: bool | None = None) -> dict[str, Any] | XtnObject:
+        '''Builds the merged document. It is an XtnObject if as_xtn is True, or if as_xtn is None and the last layer is an XtnObject,
+        otherwise a dict. Values from layers of the other kind are converted.'''
+        if as_xtn is None:
+            as_xtn = len(self.layers) > 0 and isinstance(self.layers[-1], XtnObject)
+        convert = _to_xtn if as_xtn else _to_plain
+        elements = {key: (value.materialize(as_xtn) if isinstance(value, XtnOverlay) else convert(value)) for key, value in self.items()}
+        return XtnObject(elements) if as_xtn else elements
+
+
+def _to_xtn(value: Any) -> XtnDataElement:
+    if isinstance(value, XtnDataElement):
+        return value
+    elif isinstance(value, Mapping):
+        return _make_Xtn({k: _to_xtn(v) for k, v in value.items()})
+    elif isinstance(value, (list, tuple)):
+        return _make_Xtn([_to_xtn(v) for v in value])
+    return _make_Xtn(value)
+
+
+def _to_plain(value: Any) -> Any:
+    if isinstance(value, XtnText):
+        return value.value
+    elif isinstance(value, XtnArray):
+        return [_to_plain(v) for v in value.elements]
+    elif isinstance(value, XtnObject):
+        return {k: _to_plain(v) for k, v in value.elements.items()}
+    elif isinstance(value, Mapping):
+        return {k: _to_plain(v) for k, v in value.items()}
+    elif isinstance(value, (list, tuple)):
+        return [_to_plain(v) for v in value]
+    return value
+
+
 def _make_Xtn(value: dict[str, Any] | list | str):
     if isinstance(value, list):
         return XtnArray(value)
@@ -165,9 +635,10 @@ class _ObjectState:
     current: dict[str, Any]
     target: XtnObject | None
     in_array: bool
+    setter: Callable[[Any], None] | None = None
     mode: Literal[_Mode.OBJECT] = _Mode.OBJECT
 
-    def set(self, name: str, value: dict[str, Any] | list | str, raise_error: Callable[[XtnErrorCode, str], NoReturn], complex_setter: list[Callable[[str], None]] | None = None):
+    def set(self, name: str, value: dict[str, Any] | list | str, raise_error: Callable[[XtnErrorCode, str], NoReturn], complex_setter: list[Callable[[str | XtnTextFile], None]] | None = None):
         # verify that name does not have disallowed characters
         name = _convert_spaces(name, True)
         if isinstance(value, str):
@@ -180,7 +651,7 @@ class _ObjectState:
             if (complex_setter is not None):
                 dict = self.current
                 n = name
-                def updater(v: str):
+                def updater(v: str | XtnTextFile):
                     dict[n] = v;
                 complex_setter[0] = updater
             return None
@@ -188,7 +659,7 @@ class _ObjectState:
             child = _make_Xtn(value)
             self.current[name] = child
             if (complex_setter is not None):
-                def updater(v: str):
+                def updater(v: str | XtnTextFile):
                     child.value = v;
                 complex_setter[0] = updater
             return child
@@ -199,9 +670,10 @@ class _ArrayState:
     start_line: int
     current: list
     target: XtnArray | None
+    setter: Callable[[Any], None] | None = None
     mode: Literal[_Mode.ARRAY] = _Mode.ARRAY
 
-    def set(self, name: str, value: dict[str, Any] | list | str, raise_error: Callable[[XtnErrorCode, str], NoReturn], complex_setter: list[Callable[[str], None]] | None = None):
+    def set(self, name: str, value: dict[str, Any] | list | str, raise_error: Callable[[XtnErrorCode, str], NoReturn], complex_setter: list[Callable[[str | XtnTextFile], None]] | None = None):
         name = _convert_spaces(name, True)
         if isinstance(value, str):
             value = _convert_spaces(value, False)
@@ -217,7 +689,7 @@ class _ArrayState:
             if (complex_setter is not None):
                 arr = self.current
                 i = len(arr) - 1
-                def updater(v: str):
+                def updater(v: str | XtnTextFile):
                     arr[i] = v;
                 complex_setter[0] = updater
             return None
@@ -225,7 +697,7 @@ class _ArrayState:
             child = _make_Xtn(value)
             self.current.append(child)
             if (complex_setter is not None):
-                def updater(v: str):
+                def updater(v: str | XtnTextFile):
                     child.value = v;
                 complex_setter[0] = updater
             return child
@@ -235,15 +707,55 @@ class _ArrayState:
 class _MultilineState:
     start_line: int
     target: XtnText | None
-    setter: Callable[[str], None] | None
+    setter: Callable[[str | XtnTextFile], None] | None
     indent: str
     indent_char: str = ' '
     exp_indent: str | None = None
-    text: str = ''
+    spill_threshold: int | None = None
+    lines: list[str] = field(default_factory=list)
+    size: int = 0
+    spill: IO[str] | None = None
+    spill_file: XtnTextFile | None = None
     mode: Literal[_Mode.MULTILINE] = _Mode.MULTILINE
 
+    def append(self, line: str):
+        self.size += len(line)
+        if self.spill is None and self.spill_threshold is not None and self.size > self.spill_threshold:
+            self.spill = tempfile.NamedTemporaryFile('w', encoding='utf-8', newline='', delete=False)
+            self.spill_file = XtnTextFile(self.spill.name)
+            # the only owner of the file, copies of the handle never remove it
+            self.spill_file._finalizer = weakref.finalize(self.spill_file, _remove_file, self.spill.name)
+        if self.spill is not None:
+            # the last line is held back so that its newline can be dropped when the value ends
+            self.spill.writelines(self.lines)
+            self.lines.clear()
+        self.lines.append(line)
+
+    def finish(self) -> str | XtnTextFile:
+        if len(self.lines) > 0:
+            self.lines[-1] = _strip_line_end(self.lines[-1])
+        if self.spill is None:
+            return ''.join(self.lines)
+        self.spill.writelines(self.lines)
+        self.lines.clear()
+        self.spill.close()
+        return self.spill_file  # type: ignore
+
+
+def _freeze_state(state: _ObjectState | _ArrayState):
+    # children are frozen when they close, so only this level needs to be wrapped
+    frozen = XtnFrozenDict(state.current) if state.mode == _Mode.OBJECT else tuple(state.current)
+    if state.target is None:
+        if state.setter is not None:
+            state.setter(frozen)
+    else:
+        state.target.elements = frozen  # type: ignore
+        for child in (frozen.values() if isinstance(frozen, XtnFrozenDict) else frozen):
+            _seal(child)
+    return frozen
+
 
-def _load(f: TextIO, target: XtnObject | None) -> dict[str, Any]:
+def _load(f: TextIO, target: XtnObject | None, spill_threshold: int | None = None, limits: XtnLimits | None = None, frozen: bool = False) -> Mapping[str, Any]:
     top_level = {} if target is None else target.elements
     stack: list[_ObjectState | _ArrayState | _MultilineState] = [
         _ObjectState(current=top_level, target=target, start_line=-1, in_array=False)]
@@ -315,137 +827,186 @@ def _load(f: TextIO, target: XtnObject | None) -> dict[str, Any]:
             up_target = target
             up_prop = 'below'
 
+    if limits is None:
+        limits = XtnLimits()
+    max_size, max_line_length, max_depth, max_keys, max_text_length = \
+        limits.max_size, limits.max_line_length, limits.max_depth, limits.max_keys, limits.max_text_length
+    size = 0
+
+    def read_bounded_lines():
+        # never read past the line length limit and its terminator (\r\n fits in two characters) or the remaining size
+        while True:
+            limit = -1 if max_line_length is None else max_line_length + 2
+            if max_size is not None and (limit < 0 or max_size - size + 1 < limit):
+                limit = max_size - size + 1
+            line = f.readline(limit)
+            if len(line) == 0:
+                return
+            yield line
+
+    lines = f if max_line_length is None and max_size is None else read_bounded_lines()
+
     complex_setter = [None]
     i = -1
-    for i, orig_line in enumerate(f):
-        line = orig_line
-        state = stack[-1]
-        if state.mode == _Mode.MULTILINE:
-            if state.exp_indent is None:
-                if len(state.indent) > 0:
-                    state.indent_char = state.indent[0]
-                    state.exp_indent = state.indent + state.indent_char * \
-                        (1 if state.indent_char == '\t' else 4)
-                elif line[:1] == '\t':
-                    state.exp_indent = '\t'
-                    state.indent_char = '\t'
-                else:
-                    state.exp_indent = '    '
-                    state.indent_char = ' '
-            exp_indent_len = len(state.exp_indent)
-            act_indent_len = 0
-            prefix = line[0:exp_indent_len]
-            act_indent = prefix[:(
-                len(prefix) - len(prefix.lstrip(state.indent_char)))]
-            act_indent_len = len(act_indent)
-            prefix = prefix[act_indent_len:act_indent_len+1]
-            if act_indent_len < exp_indent_len and prefix.isspace() and prefix != '\n':
-                raise_error(XtnErrorCode.INDENTATION_MUST_NOT_BE_MIXED,
-                            f"Indentation for a complex text value can use either spaces or tabs but not both")
-            line = line[act_indent_len:]
-            if act_indent_len < exp_indent_len:
-                if line.startswith('----') and (len(line) == 4 or line[4:].isspace()):
-                    if act_indent_len == len(state.indent):
-                        state.setter(state.text[0:-1])
-                        stack.pop()
-                        continue
-                    raise_error(XtnErrorCode.INCORRECT_INDENTATION,
-                                f"The indentation on the closing line for a complex text value must exactly match the key line")
-                if prefix != '\n':
-                    raise_error(XtnErrorCode.INSUFFICIENT_INDENTATION,
-                                f"Lines of complex text must be indented by 4 spaces or a tab compared to the key line")
-
-            state.text = state.text + line
-            state.setter(state.text)
-        else:
-            line = line.strip()
-            if line.startswith('#'):
-                record_comment(line)
-                continue
-            if (len(line) == 0):
-                record_comment(line)
-                continue
-            left, sep, right = line.partition(':')
-            left = left.rstrip()
-            right = right.lstrip()
-            if sep == ':':
-                if len(left) == 0:
-                    raise_error(XtnErrorCode.LINE_MUST_NOT_START_WITH_COLON,
-                                f"A line cannot start with a colon")
-                elif left.startswith('+') and state.mode == _Mode.OBJECT:
-                    raise_error(XtnErrorCode.PLUS_ENCOUNTERED_OUTSIDE_ARRAY,
-                                f"A line cannot start with a plus outside the context of an array")
-
-                if left.endswith('{}'):
-                    if len(right) > 0:
-                        raise_error(XtnErrorCode.OBJECT_MUST_BE_ON_NEW_LINE,
-                                    f"An object must start on a new line")
-                    name = left[0:-2].rstrip()
-                    obj = {}
-                    child_target = state.set(name, obj, raise_error)
-                    attach_comments(child_target)
-                    stack.append(_ObjectState(start_line=i, current=obj,
-                                              target=child_target, in_array=state.mode == _Mode.ARRAY))  # type: ignore
-                elif left.endswith('[]'):
-                    if len(right) > 0:
-                        raise_error(XtnErrorCode.ARRAY_MUST_BE_ON_NEW_LINE,
-                                    f"An array must start on a new line")
-                    name = left[0:-2].rstrip()
-                    obj = []
-                    child_target = state.set(name, obj, raise_error)
-                    attach_comments(child_target)
-                    # type: ignore
-                    stack.append(_ArrayState(
-                        start_line=i, current=obj, target=child_target))  # type: ignore
-                elif left.endswith("''"):
-                    indent = orig_line[:orig_line.find(left[0])]
-                    if len(indent) > 0:
-                        indent_char = indent[0]
-                        if indent_char != ' ' and indent_char != '\t':
-                            raise_error(XtnErrorCode.INDENTATION_MUST_BE_SPACE_OR_TAB,
-                                        f"Indentation for a complex text value must be a space (32) or tab (9) character")
-                        if len(indent.lstrip(indent_char)) > 0:
-                            raise_error(XtnErrorCode.INDENTATION_MUST_NOT_BE_MIXED,
-                                        f"Indentation for a complex text value can use either spaces or tabs but not both")
-
-                    name = left[0:-2].rstrip()
-                    if len(right) > 0:
-                        raise_error(XtnErrorCode.MULTILINE_MUST_BE_ON_NEW_LINE,
-                                    f"A multi-line value must start on a new line")
-                    child_target = state.set(name, '', raise_error, complex_setter)
-                    if child_target is not None:
-                        child_target.force_multiline = True  # type: ignore
+    try:
+        for i, orig_line in enumerate(lines):
+            if max_line_length is not None and len(_strip_line_end(orig_line)) > max_line_length:
+                raise_error(XtnErrorCode.MAX_LINE_LENGTH_EXCEEDED,
+                            f"A line cannot be longer than {max_line_length} characters")
+            if max_size is not None:
+                size += len(orig_line)
+                if size > max_size:
+                    raise_error(XtnErrorCode.MAX_SIZE_EXCEEDED,
+                                f"The input cannot be larger than {max_size} characters")
+            line = orig_line
+            state = stack[-1]
+            if state.mode == _Mode.MULTILINE:
+                if state.exp_indent is None:
+                    if len(state.indent) > 0:
+                        state.indent_char = state.indent[0]
+                        state.exp_indent = state.indent + state.indent_char * \
+                            (1 if state.indent_char == '\t' else 4)
+                    elif line[:1] == '\t':
+                        state.exp_indent = '\t'
+                        state.indent_char = '\t'
+                    else:
+                        state.exp_indent = '    '
+                        state.indent_char = ' '
+                exp_indent_len = len(state.exp_indent)
+                act_indent_len = 0
+                prefix = line[0:exp_indent_len]
+                act_indent = prefix[:(
+                    len(prefix) - len(prefix.lstrip(state.indent_char)))]
+                act_indent_len = len(act_indent)
+                prefix = prefix[act_indent_len:act_indent_len+1]
+                if act_indent_len < exp_indent_len and prefix.isspace() and prefix != '\n':
+                    raise_error(XtnErrorCode.INDENTATION_MUST_NOT_BE_MIXED,
+                                f"Indentation for a complex text value can use either spaces or tabs but not both")
+                line = line[act_indent_len:]
+                if act_indent_len < exp_indent_len:
+                    if line.startswith('----') and (len(line) == 4 or line[4:].isspace()):
+                        if act_indent_len == len(state.indent):
+                            state.setter(state.finish())
+                            stack.pop()
+                            continue
+                        raise_error(XtnErrorCode.INCORRECT_INDENTATION,
+                                    f"The indentation on the closing line for a complex text value must exactly match the key line")
+                    if prefix != '\n':
+                        raise_error(XtnErrorCode.INSUFFICIENT_INDENTATION,
+                                    f"Lines of complex text must be indented by 4 spaces or a tab compared to the key line")
+
+                state.append(line)
+                if max_text_length is not None and state.size - 1 > max_text_length:
+                    raise_error(XtnErrorCode.MAX_TEXT_LENGTH_EXCEEDED,
+                                f"A complex text value cannot be longer than {max_text_length} characters")
+            else:
+                line = line.strip()
+                if line.startswith('#'):
+                    record_comment(line)
+                    continue
+                if (len(line) == 0):
+                    record_comment(line)
+                    continue
+                left, sep, right = line.partition(':')
+                left = left.rstrip()
+                right = right.lstrip()
+                if sep == ':':
+                    if len(left) == 0:
+                        raise_error(XtnErrorCode.LINE_MUST_NOT_START_WITH_COLON,
+                                    f"A line cannot start with a colon")
+                    elif left.startswith('+') and state.mode == _Mode.OBJECT:
+                        raise_error(XtnErrorCode.PLUS_ENCOUNTERED_OUTSIDE_ARRAY,
+                                    f"A line cannot start with a plus outside the context of an array")
+                    if max_keys is not None and len(state.current) >= max_keys:
+                        raise_error(XtnErrorCode.MAX_KEYS_EXCEEDED,
+                                    f"An object or array cannot have more than {max_keys} elements")
+                    if max_depth is not None and len(stack) > max_depth and (left.endswith('{}') or left.endswith('[]')):
+                        raise_error(XtnErrorCode.MAX_DEPTH_EXCEEDED,
+                                    f"Objects and arrays cannot be nested more than {max_depth} levels deep")
+
+                    if left.endswith('{}'):
+                        if len(right) > 0:
+                            raise_error(XtnErrorCode.OBJECT_MUST_BE_ON_NEW_LINE,
+                                        f"An object must start on a new line")
+                        name = left[0:-2].rstrip()
+                        obj = {}
+                        child_target = state.set(name, obj, raise_error, complex_setter if frozen else None)
+                        attach_comments(child_target)
+                        stack.append(_ObjectState(start_line=i, current=obj,
+                                                  target=child_target, in_array=state.mode == _Mode.ARRAY, setter=complex_setter[0] if frozen else None))  # type: ignore
+                    elif left.endswith('[]'):
+                        if len(right) > 0:
+                            raise_error(XtnErrorCode.ARRAY_MUST_BE_ON_NEW_LINE,
+                                        f"An array must start on a new line")
+                        name = left[0:-2].rstrip()
+                        obj = []
+                        child_target = state.set(name, obj, raise_error, complex_setter if frozen else None)
                         attach_comments(child_target)
-                    stack.append(_MultilineState(start_line=i, target=child_target, setter=complex_setter[0], indent=indent))
+                        # type: ignore
+                        stack.append(_ArrayState(
+                            start_line=i, current=obj, target=child_target, setter=complex_setter[0] if frozen else None))  # type: ignore
+                    elif left.endswith("''"):
+                        indent = orig_line[:orig_line.find(left[0])]
+                        if len(indent) > 0:
+                            indent_char = indent[0]
+                            if indent_char != ' ' and indent_char != '\t':
+                                raise_error(XtnErrorCode.INDENTATION_MUST_BE_SPACE_OR_TAB,
+                                            f"Indentation for a complex text value must be a space (32) or tab (9) character")
+                            if len(indent.lstrip(indent_char)) > 0:
+                                raise_error(XtnErrorCode.INDENTATION_MUST_NOT_BE_MIXED,
+                                            f"Indentation for a complex text value can use either spaces or tabs but not both")
+
+                        name = left[0:-2].rstrip()
+                        if len(right) > 0:
+                            raise_error(XtnErrorCode.MULTILINE_MUST_BE_ON_NEW_LINE,
+                                        f"A multi-line value must start on a new line")
+                        child_target = state.set(name, '', raise_error, complex_setter)
+                        if child_target is not None:
+                            child_target.force_multiline = True  # type: ignore
+                            attach_comments(child_target)
+                        stack.append(_MultilineState(start_line=i, target=child_target, setter=complex_setter[0], indent=indent, spill_threshold=spill_threshold))
+                    else:
+                        child_target = state.set(left, right, raise_error)
+                        attach_comments(child_target)
+
+                elif left.startswith('----') and (len(left) == 4 or left[4:].isspace()):
+                    attach_trailing_comments(stack[-1].target)
+                    closed = stack.pop()
+                    if len(stack) == 0:
+                        raise_error(XtnErrorCode.UNMATCHED_CLOSE_MARKER,
+                                    "The close marker ---- does not match any open object or array")
+                    if frozen:
+                        _freeze_state(closed)  # type: ignore
                 else:
-                    child_target = state.set(left, right, raise_error)
-                    attach_comments(child_target)
-
-            elif left.startswith('----') and (len(left) == 4 or left[4:].isspace()):
-                attach_trailing_comments(stack[-1].target)
-                stack.pop()
-                if len(stack) == 0:
-                    raise_error(XtnErrorCode.UNMATCHED_CLOSE_MARKER,
-                                "The close marker ---- does not match any open object or array")
-            else:
-                if state.mode == _Mode.ARRAY:
-                    if left[0] == '+':
+                    if state.mode == _Mode.ARRAY:
+                        if left[0] == '+':
+                            raise_error(XtnErrorCode.MISSING_COLON,
+                                        f"A colon was expected")
+                        else:
+                            raise_error(XtnErrorCode.ARRAY_ELEMENT_MUST_START_WITH_PLUS,
+                                        f"An array element must start with a plus")
+                    else:
                         raise_error(XtnErrorCode.MISSING_COLON,
                                     f"A colon was expected")
-                    else:
-                        raise_error(XtnErrorCode.ARRAY_ELEMENT_MUST_START_WITH_PLUS,
-                                    f"An array element must start with a plus")
-                else:
-                    raise_error(XtnErrorCode.MISSING_COLON,
-                                f"A colon was expected")
     
-    attach_trailing_comments(stack[-1].target)
-    i += 1
-    if len(stack) > 1:
-        raise_error(XtnErrorCode.MISSING_CLOSE_MARKER,
-                    "A close marker ---- was expected")
+        attach_trailing_comments(stack[-1].target)
+        i += 1
+        if len(stack) > 1:
+            raise_error(XtnErrorCode.MISSING_CLOSE_MARKER,
+                        "A close marker ---- was expected")
+    except BaseException:
+        state = stack[-1] if len(stack) > 0 else None
+        if state is not None and state.mode == _Mode.MULTILINE and state.spill is not None:
+            # close the handle first, an open file cannot be removed on Windows
+            state.spill.close()
+            state.spill_file.close()  # type: ignore
+        raise
+    if frozen:
+        top_level = _freeze_state(stack[0])  # type: ignore
+        if target is not None:
+            _seal(target)
     return top_level
 
 
-def load(f: TextIO):
-    return _load(f, None)
+def load(f: TextIO, spill_threshold: int | None = None, limits: XtnLimits | None = None, frozen: bool = False):
+    return _load(f, None, spill_threshold, limits, frozen)